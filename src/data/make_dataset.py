@@ -17,17 +17,21 @@ TARGET = "sobstv"
 
 @click.command()
 @click.argument("output_filepath", type=click.Path())
-def main(output_filepath: str) -> None:
+@click.option("--first-page", type=int, default=1, help="First page to parse.")
+@click.option("--last-page", type=int, default=N, help="Last page to parse.")
+def main(output_filepath: str, first_page: int, last_page: int) -> None:
     """Create dataset from outer source.
 
     @param output_filepath: path to external dataset
+    @param first_page: first page to parse
+    @param last_page: last page to parse
     """
     logger = logging.getLogger(__name__)
     logger.info("Create dataset from outer source")
 
     # Extract pages with ads
     pages = []
-    for page in tqdm(range(1, N + 1)):
+    for page in tqdm(range(first_page, last_page + 1)):
         one_page = get_ads_by_page_number(target=TARGET, page=page)
         pages.append(nested_check("offersSerialized", one_page)[0])
 
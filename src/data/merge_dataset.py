@@ -0,0 +1,26 @@
+"""Merge dataset shards into one dataset."""
+from typing import Tuple
+
+import click
+import pandas as pd
+
+
+@click.command()
+@click.argument("input_filepaths", nargs=-1, type=click.Path(exists=True))
+@click.argument("output_filepath", type=click.Path())
+def main(input_filepaths: Tuple[str, ...], output_filepath: str) -> None:
+    """Concatenate shards and drop ads repeated on neighbouring pages.
+
+    @param input_filepaths: paths to shards
+    @param output_filepath: path to merged dataset
+    """
+    df = pd.concat(
+        [pd.read_csv(filepath) for filepath in input_filepaths],
+        ignore_index=True,
+    )
+    df = df.drop_duplicates()
+    df.to_csv(output_filepath, index=False)
+
+
+if __name__ == "__main__":
+    main()
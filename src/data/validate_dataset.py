@@ -0,0 +1,64 @@
+"""Validate processed dataset before training."""
+import json
+from typing import Any, Dict, List
+
+import click
+import pandas as pd
+
+from ..features.build_features import CAT_FEATURES, TARGET, load_features
+from .transform_dataset import TARGET_COLUMNS
+
+MIN_ROWS = 100
+
+
+def validate_dataset(df: pd.DataFrame) -> List[str]:
+    """Check that dataset is fit for training.
+
+    @param df: processed dataset
+    @return: found errors
+    """
+    errors = []
+    missing_columns = [col for col in TARGET_COLUMNS if col not in df.columns]
+    if missing_columns:
+        errors.append(f"Missing columns: {missing_columns}")
+        return errors
+    if len(df) < MIN_ROWS:
+        errors.append(f"Too few rows: {len(df)} < {MIN_ROWS}")
+    if df[TARGET].isna().any() or (df[TARGET] <= 0).any():
+        errors.append(f"Missing or non-positive values in '{TARGET}'")
+    numeric_columns = [col for col in TARGET_COLUMNS if col not in CAT_FEATURES]
+    for column in numeric_columns:
+        if not pd.api.types.is_numeric_dtype(df[column]):
+            errors.append(f"Non-numeric values in '{column}'")
+    return errors
+
+
+def get_summary(df: pd.DataFrame) -> Dict[str, Any]:
+    """Get dataset summary for validation report.
+
+    @param df: processed dataset
+    @return: rows count and share of missing values per column
+    """
+    missing = df.replace("nan", None).isna().mean().round(4)
+    return {"rows": len(df), "missing_share": missing.to_dict()}
+
+
+@click.command()
+@click.argument("input_filepath", type=click.Path(exists=True))
+@click.argument("output_filepath", type=click.Path())
+def main(input_filepath: str, output_filepath: str) -> None:
+    """Validate processed dataset and write validation report.
+
+    @param input_filepath: path to processed dataset
+    @param output_filepath: path to validation report
+    """
+    df = load_features(input_filepath)
+    errors = validate_dataset(df)
+    if errors:
+        raise click.ClickException("; ".join(errors))
+    with open(output_filepath, "w", encoding="utf-8") as f:
+        json.dump(get_summary(df), f, ensure_ascii=False, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Build features for modeling from interim dataset."""
+from typing import Union
+
+import click
+import pandas as pd
+
+TARGET = "Стоимость, р."
+
+MAX_PRICE = 20000000
+
+CAT_FEATURES = [
+    "Тип жилья",
+    "Планировка",
+    "Санузел",
+    "Ремонт",
+    "Вид из окон",
+    "Балкон/лоджия",
+    "Технология строительства",
+    "Район",
+    "Станция метро",
+]
+
+
+def ceiling_height(string: Union[str, float]) -> float:
+    """Get ceiling height in meters from string like '2,8 м'.
+
+    @param string: raw ceiling height
+    @return: ceiling height
+    """
+    if pd.isna(string):
+        return float("nan")
+    else:
+        string = str(string).replace(",", ".").split("м")[0].strip()
+        return float(string)
+
+
+def fill_cat_features(df: pd.DataFrame) -> pd.DataFrame:
+    """Fill missing values of categorical features with 'nan' string.
+
+    @param df: dataset
+    @return: dataset without missing categorical values
+    """
+    df = df.copy()
+    df[CAT_FEATURES] = df[CAT_FEATURES].fillna("nan").astype(str)
+    return df
+
+
+def load_features(filepath: str) -> pd.DataFrame:
+    """Read processed dataset ready for CatBoost.
+
+    @param filepath: path to processed dataset
+    @return: processed dataset
+    """
+    return fill_cat_features(pd.read_csv(filepath))
+
+
+def build_features(df: pd.DataFrame) -> pd.DataFrame:
+    """Clean interim data and drop price outliers.
+
+    @param df: interim dataset
+    @return: dataset with features and target
+    """
+    df = fill_cat_features(df)
+    df["Высота потолков"] = df["Высота потолков"].apply(ceiling_height)
+    df = df[df[TARGET] <= MAX_PRICE]
+    return df.reset_index(drop=True)
+
+
+@click.command()
+@click.argument("input_filepath", type=click.Path(exists=True))
+@click.argument("output_filepath", type=click.Path())
+def main(input_filepath: str, output_filepath: str) -> None:
+    """Build features from interim dataset and write processed dataset.
+
+    @param input_filepath: path to interim dataset
+    @param output_filepath: path to processed dataset
+    """
+    df = pd.read_csv(input_filepath)
+    df = build_features(df)
+    df.to_csv(output_filepath, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Explain model predictions with CatBoost native SHAP values."""
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import click
+import pandas as pd
+from catboost import CatBoostRegressor
+
+from ..features.build_features import load_features
+from .train_model import load_model, make_pool, split_target
+
+CACHE_SIZE = 10000
+
+EXPECTED_VALUE = "Базовое значение"
+
+GROUP_COLUMN = "Район"
+
+ALL_GROUPS = "Все районы"
+
+
+class Explainer:
+    """SHAP explainer with cache of already explained feature vectors.
+
+    Cache is guarded by lock, so one explainer can serve many threads.
+    """
+
+    def __init__(
+            self,
+            model: CatBoostRegressor,
+            cache_size: int = CACHE_SIZE
+    ) -> None:
+        """Create explainer for trained model.
+
+        @param model: trained model
+        @param cache_size: max count of cached explanations
+        """
+        self.model = model
+        self.cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def shap_values(self, X: pd.DataFrame) -> pd.DataFrame:
+        """Compute SHAP values for batch of feature vectors.
+
+        @param X: features
+        @return: SHAP value per feature and expected value per row
+        """
+        values = self.model.get_feature_importance(
+            make_pool(X), type="ShapValues"
+        )
+        return pd.DataFrame(
+            values,
+            columns=list(X.columns) + [EXPECTED_VALUE],
+            index=X.index,
+        )
+
+    def _row_keys(self, X: pd.DataFrame) -> Tuple[pd.DataFrame, List[tuple]]:
+        """Get cache keys of rows.
+
+        Key is tuple of row values in model feature order. Equal int and
+        float values hash equally, missing values are replaced by None.
+
+        @param X: features
+        @return: features in model order and row keys
+        """
+        if list(X.columns) != self.model.feature_names_:
+            X = X[self.model.feature_names_]
+        values = X.to_numpy(dtype=object)
+        values[pd.isna(values)] = None
+        return X, [tuple(row) for row in values]
+
+    def explain(self, X: pd.DataFrame) -> pd.DataFrame:
+        """Explain batch, computing SHAP values only for uncached rows.
+
+        @param X: features
+        @return: SHAP value per feature and expected value per row
+        """
+        X, keys = self._row_keys(X)
+        with self._lock:
+            found = {key: self._cache[key] for key in keys
+                     if key in self._cache}
+        missing = [i for i, key in enumerate(keys) if key not in found]
+        computed = {}
+        if missing:
+            # Duplicates inside batch are explained once
+            positions = list({keys[i]: i for i in missing}.values())
+            values = self.shap_values(X.iloc[positions]).values
+            computed = {keys[i]: row for i, row in zip(positions, values)}
+        with self._lock:
+            for key in found:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+            self._cache.update(computed)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        found.update(computed)
+        return pd.DataFrame(
+            [found[key] for key in keys],
+            columns=list(X.columns) + [EXPECTED_VALUE],
+            index=X.index,
+        )
+
+    def predict_explained(self, X: pd.DataFrame) -> pd.DataFrame:
+        """Predict price and explain prediction.
+
+        SHAP values of a row sum up to its prediction.
+
+        @param X: features
+        @return: prediction and SHAP values per row
+        """
+        explanation = self.explain(X)
+        explanation.insert(0, "Прогноз", explanation.sum(axis=1))
+        return explanation
+
+
+def build_importance_report(
+        model: CatBoostRegressor,
+        X: pd.DataFrame
+) -> pd.DataFrame:
+    """Compute mean absolute SHAP value of features per district.
+
+    @param model: trained model
+    @param X: features
+    @return: global importance summary, one row per district
+    """
+    shap_values = Explainer(model).shap_values(X)
+    importance = shap_values.drop(EXPECTED_VALUE, axis=1).abs()
+    report = importance.groupby(X[GROUP_COLUMN]).mean()
+    report.loc[ALL_GROUPS] = importance.mean()
+    counts = X[GROUP_COLUMN].value_counts()
+    counts[ALL_GROUPS] = len(X)
+    report.insert(0, "Количество объявлений", counts.reindex(report.index))
+    report.index.name = GROUP_COLUMN
+    return report
+
+
+@click.command()
+@click.argument("input_filepath", type=click.Path(exists=True))
+@click.argument("models_dir", type=click.Path(exists=True))
+@click.argument("output_filepath", type=click.Path())
+@click.option(
+    "--version", default=None, help="Model version, latest if not set."
+)
+def main(
+        input_filepath: str,
+        models_dir: str,
+        output_filepath: str,
+        version: Optional[str]
+) -> None:
+    """Precompute feature importance summary per district.
+
+    @param input_filepath: path to processed dataset
+    @param models_dir: path to models directory
+    @param output_filepath: path to importance report
+    @param version: model version
+    """
+    model, _, _ = load_model(models_dir, version)
+    if model is None:
+        raise click.ClickException(f"No trained model in {models_dir}")
+    X, _ = split_target(load_features(input_filepath))
+    report = build_importance_report(model, X)
+    report.to_csv(output_filepath)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Score dataset with trained model."""
+from typing import Optional
+
+import click
+import numpy as np
+import pandas as pd
+from catboost import CatBoostRegressor
+
+from ..features.build_features import TARGET, load_features
+from .train_model import load_model, make_pool
+
+PREDICTION = "Прогноз стоимости, р."
+
+
+def predict(model: CatBoostRegressor, X: pd.DataFrame) -> np.ndarray:
+    """Predict apartment prices.
+
+    @param model: trained model
+    @param X: features
+    @return: predicted prices
+    """
+    return model.predict(make_pool(X))
+
+
+@click.command()
+@click.argument("input_filepath", type=click.Path(exists=True))
+@click.argument("models_dir", type=click.Path(exists=True))
+@click.argument("output_filepath", type=click.Path())
+@click.option(
+    "--version", default=None, help="Model version, latest if not set."
+)
+def main(
+        input_filepath: str,
+        models_dir: str,
+        output_filepath: str,
+        version: Optional[str]
+) -> None:
+    """Score dataset and write it with predicted prices.
+
+    @param input_filepath: path to dataset with features
+    @param models_dir: path to models directory
+    @param output_filepath: path to scored dataset
+    @param version: model version
+    """
+    model, _, _ = load_model(models_dir, version)
+    if model is None:
+        raise click.ClickException(f"No trained model in {models_dir}")
+    df = load_features(input_filepath)
+    df[PREDICTION] = predict(model, df.drop(TARGET, axis=1, errors="ignore"))
+    df.to_csv(output_filepath, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,499 @@
+"""Train CatBoost model from scratch or warm-start it on new data."""
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import click
+import numpy as np
+import pandas as pd
+from catboost import CatBoostError, CatBoostRegressor, Pool
+from sklearn.model_selection import train_test_split
+
+from ..features.build_features import CAT_FEATURES, TARGET, load_features
+
+RANDOM_STATE = 42
+
+MODEL_PARAMS = {
+    "iterations": 1000,
+    "learning_rate": 0.1,
+    "random_seed": RANDOM_STATE,
+    "depth": 5,
+    "task_type": "CPU",
+    "loss_function": "RMSE",
+    "l2_leaf_reg": 10,
+    "use_best_model": True,
+    "bagging_temperature": 1000,
+    "allow_writing_files": False,
+}
+
+# Warm start continues boosting with fewer and smaller steps
+UPDATE_PARAMS = {
+    "iterations": 200,
+    "learning_rate": 0.03,
+}
+
+EARLY_STOPPING_ROUNDS = 10
+
+# Drift thresholds: exceeding any of them forces full retrain
+MIN_NEW_ROWS = 10
+MAX_NEW_ROWS_SHARE = 0.5
+# Mean shift of new rows in standard errors, max is taken over columns
+MAX_MEAN_SHIFT_Z = 4.0
+MAX_UNSEEN_CATEGORIES_SHARE = 0.2
+MAX_MAPE_DEGRADATION = 1.5
+
+# Update is rejected if it is worse than parent on parent's holdout
+MIN_HOLDOUT_ROWS = 20
+MAX_HOLDOUT_DEGRADATION = 1.1
+
+MODEL_FILE = "model.cbm"
+METADATA_FILE = "metadata.json"
+ROWS_FILE = "rows.npy"
+SPLIT_FILE = "split.npz"
+REGISTRY_FILE = "registry.json"
+
+
+def mape(y_true: Any, y_pred: Any) -> float:
+    """Mean absolute percentage error.
+
+    @param y_true: true values
+    @param y_pred: predicted values
+    @return: MAPE, %
+    """
+    y_true, y_pred = np.array(y_true), np.array(y_pred)
+    return round(float(np.mean(np.abs((y_true - y_pred) / y_true)) * 100), 2)
+
+
+def make_pool(X: pd.DataFrame, y: Optional[pd.Series] = None) -> Pool:
+    """Create CatBoost pool with categorical features.
+
+    @param X: features
+    @param y: target
+    @return: CatBoost pool
+    """
+    return Pool(data=X, label=y, cat_features=CAT_FEATURES)
+
+
+def split_target(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+    """Split dataset to features and target.
+
+    @param df: processed dataset
+    @return: features and target
+    """
+    return df.drop(TARGET, axis=1), df[TARGET]
+
+
+def normalize_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast rows to one form so equal rows hash equally.
+
+    Int column with missing value becomes float after CSV round trip,
+    so numeric columns are cast to float and columns are sorted.
+
+    @param df: dataset with or without target
+    @return: normalized dataset
+    """
+    df = df[sorted(df.columns)].copy()
+    for column in df.columns:
+        if column in CAT_FEATURES:
+            df[column] = df[column].astype(str)
+        else:
+            df[column] = df[column].astype(np.float64)
+    return df
+
+
+def hash_rows(df: pd.DataFrame) -> np.ndarray:
+    """Hash dataset rows to find rows unseen by previous model.
+
+    @param df: dataset with or without target
+    @return: row hashes
+    """
+    return pd.util.hash_pandas_object(
+        normalize_rows(df), index=False
+    ).values
+
+
+def get_feature_stats(X: pd.DataFrame) -> Dict[str, Any]:
+    """Get reference feature stats for drift checks.
+
+    @param X: features
+    @return: mean and std of numeric features, categories of categorical
+    """
+    numeric = X.drop(CAT_FEATURES, axis=1).astype(float)
+    stats = {"numeric": {}, "categorical": {}}
+    for column in numeric.columns:
+        mean, std = numeric[column].mean(), numeric[column].std()
+        stats["numeric"][column] = {
+            "mean": None if pd.isna(mean) else float(mean),
+            "std": None if pd.isna(std) else float(std),
+        }
+    for column in CAT_FEATURES:
+        stats["categorical"][column] = sorted(X[column].unique().tolist())
+    return stats
+
+
+def check_drift(
+        model: CatBoostRegressor,
+        metadata: Dict[str, Any],
+        new_df: pd.DataFrame
+) -> Dict[str, Any]:
+    """Decide between warm-start update and full retrain.
+
+    @param model: previous model
+    @param metadata: previous model metadata
+    @param new_df: rows unseen by previous model
+    @return: drift report
+    """
+    X_new, y_new = split_target(new_df)
+    stats = metadata["feature_stats"]
+    reasons = []
+
+    new_rows_share = len(new_df) / (metadata["n_rows"] + len(new_df))
+    if new_rows_share > MAX_NEW_ROWS_SHARE:
+        reasons.append(f"new rows share {new_rows_share:.2f}")
+
+    mean_shift = {}
+    for column, ref in stats["numeric"].items():
+        values = X_new[column].astype(float).dropna()
+        if not ref["std"] or ref["mean"] is None or values.empty:
+            continue
+        std_error = ref["std"] / np.sqrt(len(values))
+        mean_shift[column] = abs(values.mean() - ref["mean"]) / std_error
+    max_mean_shift = max(mean_shift.values(), default=0.0)
+    if max_mean_shift > MAX_MEAN_SHIFT_Z:
+        column = max(mean_shift, key=mean_shift.get)
+        reasons.append(
+            f"mean shift {max_mean_shift:.2f} std errors in '{column}'"
+        )
+
+    unseen = np.zeros(len(X_new), dtype=bool)
+    for column, categories in stats["categorical"].items():
+        unseen |= ~X_new[column].isin(categories).values
+    unseen_share = float(unseen.mean())
+    if unseen_share > MAX_UNSEEN_CATEGORIES_SHARE:
+        reasons.append(f"unseen categories share {unseen_share:.2f}")
+
+    new_mape = mape(y_new, model.predict(make_pool(X_new)))
+    mape_degradation = new_mape / metadata["metrics"]["holdout_mape"]
+    if mape_degradation > MAX_MAPE_DEGRADATION:
+        reasons.append(f"MAPE on new rows {new_mape} %")
+
+    return {
+        "new_rows_share": round(new_rows_share, 4),
+        "max_mean_shift_z": round(float(max_mean_shift), 4),
+        "unseen_categories_share": round(unseen_share, 4),
+        "new_rows_mape": new_mape,
+        "full_retrain": bool(reasons),
+        "reasons": reasons,
+    }
+
+
+def train_full(
+        df: pd.DataFrame,
+        thread_count: int = -1
+) -> Tuple[CatBoostRegressor, Dict[str, float], Dict[str, np.ndarray]]:
+    """Train model from scratch on train/valid/test split.
+
+    Test split is kept as holdout to score later updates of the model.
+
+    @param df: processed dataset
+    @param thread_count: count of CatBoost threads
+    @return: model, metrics and hashes of valid and test rows
+    """
+    X, y = split_target(df)
+    X_train, X_rem, y_train, y_rem = train_test_split(
+        X, y, train_size=0.8, random_state=RANDOM_STATE, shuffle=True,
+    )
+    X_valid, X_test, y_valid, y_test = train_test_split(
+        X_rem, y_rem, test_size=0.5, random_state=RANDOM_STATE, shuffle=True,
+    )
+    model = CatBoostRegressor(**MODEL_PARAMS, thread_count=thread_count)
+    model.fit(
+        make_pool(X_train, y_train),
+        eval_set=make_pool(X_valid, y_valid),
+        early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+        verbose=False,
+    )
+    metrics = {
+        "train_mape": mape(y_train, model.predict(make_pool(X_train))),
+        "valid_mape": mape(y_valid, model.predict(make_pool(X_valid))),
+        "test_mape": mape(y_test, model.predict(make_pool(X_test))),
+    }
+    metrics["holdout_mape"] = metrics["test_mape"]
+    split = {
+        "valid": hash_rows(df.loc[X_valid.index]),
+        "test": hash_rows(df.loc[X_test.index]),
+    }
+    return model, metrics, split
+
+
+def train_update(
+        model: CatBoostRegressor,
+        new_df: pd.DataFrame,
+        valid_df: pd.DataFrame,
+        test_df: pd.DataFrame,
+        thread_count: int = -1
+) -> Tuple[CatBoostRegressor, Dict[str, float]]:
+    """Continue boosting of previous model on new rows.
+
+    Early stopping uses parent's valid rows together with part of new
+    rows, update is scored on parent's holdout.
+
+    @param model: previous model
+    @param new_df: rows unseen by previous model
+    @param valid_df: valid rows of parent full model
+    @param test_df: holdout rows of parent full model
+    @param thread_count: count of CatBoost threads
+    @return: updated model and metrics
+    """
+    X, y = split_target(new_df)
+    X_train, X_new_valid, y_train, y_new_valid = train_test_split(
+        X, y, train_size=0.8, random_state=RANDOM_STATE, shuffle=True,
+    )
+    X_old_valid, y_old_valid = split_target(valid_df)
+    X_valid = pd.concat([X_old_valid, X_new_valid])
+    y_valid = pd.concat([y_old_valid, y_new_valid])
+    X_test, y_test = split_target(test_df)
+    updated = CatBoostRegressor(
+        **{**MODEL_PARAMS, **UPDATE_PARAMS}, thread_count=thread_count
+    )
+    updated.fit(
+        make_pool(X_train, y_train),
+        eval_set=make_pool(X_valid, y_valid),
+        early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+        init_model=model,
+        verbose=False,
+    )
+    metrics = {
+        "train_mape": mape(y_train, updated.predict(make_pool(X_train))),
+        "valid_mape": mape(y_valid, updated.predict(make_pool(X_valid))),
+        "holdout_mape": mape(y_test, updated.predict(make_pool(X_test))),
+    }
+    return updated, metrics
+
+
+def load_registry(models_dir: str) -> Dict[str, Any]:
+    """Read registry of model versions.
+
+    @param models_dir: path to models directory
+    @return: registry with latest version and metrics of all versions
+    """
+    path = os.path.join(models_dir, REGISTRY_FILE)
+    if not os.path.exists(path):
+        return {"latest": None, "versions": []}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_model(
+        models_dir: str,
+        version: Optional[str] = None
+) -> Tuple[Optional[CatBoostRegressor], Dict[str, Any], np.ndarray]:
+    """Load model version with its metadata and hashes of seen rows.
+
+    @param models_dir: path to models directory
+    @param version: model version, latest if not set
+    @return: model, metadata and row hashes or None if no model
+    """
+    version = version or load_registry(models_dir)["latest"]
+    if version is None:
+        return None, {}, np.array([], dtype=np.uint64)
+    version_dir = os.path.join(models_dir, version)
+    model = CatBoostRegressor()
+    model.load_model(os.path.join(version_dir, MODEL_FILE))
+    with open(os.path.join(version_dir, METADATA_FILE), encoding="utf-8") as f:
+        metadata = json.load(f)
+    rows = np.load(os.path.join(version_dir, ROWS_FILE))
+    return model, metadata, rows
+
+
+def load_split(models_dir: str, version: str) -> Dict[str, np.ndarray]:
+    """Load hashes of valid and holdout rows of model version.
+
+    @param models_dir: path to models directory
+    @param version: model version
+    @return: hashes of valid and test rows
+    """
+    with np.load(os.path.join(models_dir, version, SPLIT_FILE)) as split:
+        return {"valid": split["valid"], "test": split["test"]}
+
+
+def save_model(
+        model: CatBoostRegressor,
+        models_dir: str,
+        metadata: Dict[str, Any],
+        rows: np.ndarray,
+        split: Dict[str, np.ndarray]
+) -> str:
+    """Save new model version and register it as latest.
+
+    @param model: trained model
+    @param models_dir: path to models directory
+    @param metadata: model metadata
+    @param rows: hashes of rows seen by model
+    @param split: hashes of valid and holdout rows
+    @return: model version
+    """
+    version = metadata["version"]
+    version_dir = os.path.join(models_dir, version)
+    os.makedirs(version_dir, exist_ok=True)
+    model.save_model(os.path.join(version_dir, MODEL_FILE))
+    with open(
+            os.path.join(version_dir, METADATA_FILE), "w", encoding="utf-8"
+    ) as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=4)
+    np.save(os.path.join(version_dir, ROWS_FILE), rows)
+    np.savez(os.path.join(version_dir, SPLIT_FILE), **split)
+
+    registry = load_registry(models_dir)
+    registry["latest"] = version
+    registry["versions"].append({
+        key: metadata[key]
+        for key in (
+            "version", "parent", "holdout_version", "mode", "created_at",
+            "metrics",
+        )
+    })
+    with open(
+            os.path.join(models_dir, REGISTRY_FILE), "w", encoding="utf-8"
+    ) as f:
+        json.dump(registry, f, ensure_ascii=False, indent=4)
+    return version
+
+
+def train(
+        df: pd.DataFrame,
+        models_dir: str,
+        warm_start: bool = False,
+        thread_count: int = -1
+) -> Optional[str]:
+    """Train new model version, warm-starting from latest one if possible.
+
+    @param df: processed dataset
+    @param models_dir: path to models directory
+    @param warm_start: continue boosting of latest model on new rows
+    @param thread_count: count of CatBoost threads
+    @return: new model version or None if there is nothing to train on
+    """
+    logger = logging.getLogger(__name__)
+    rows = hash_rows(df)
+    model, metadata, seen_rows = load_model(models_dir)
+    new_df = df[~np.isin(rows, seen_rows)]
+    mode, drift = "full", None
+    reasons: List[str] = []
+
+    if warm_start and model is None:
+        reasons.append("no previous model")
+    elif warm_start and len(new_df) == 0:
+        logger.info("No new rows, keep model %s", metadata["version"])
+        return None
+    elif warm_start and len(new_df) < MIN_NEW_ROWS:
+        logger.info(
+            "Only %d new rows, keep model %s", len(new_df), metadata["version"]
+        )
+        return None
+    elif warm_start:
+        split = load_split(models_dir, metadata["version"])
+        valid_df = df[np.isin(rows, split["valid"])]
+        test_df = df[np.isin(rows, split["test"])]
+        drift = check_drift(model, metadata, new_df)
+        reasons = drift["reasons"]
+        if len(test_df) < MIN_HOLDOUT_ROWS:
+            reasons.append(f"only {len(test_df)} holdout rows left")
+        if not reasons:
+            mode = "update"
+
+    if mode == "update":
+        logger.info("Update model %s on %d new rows",
+                    metadata["version"], len(new_df))
+        try:
+            new_model, metrics = train_update(
+                model, new_df, valid_df, test_df, thread_count
+            )
+            X_test, y_test = split_target(test_df)
+            parent_mape = mape(y_test, model.predict(make_pool(X_test)))
+            if metrics["holdout_mape"] > \
+                    parent_mape * MAX_HOLDOUT_DEGRADATION:
+                reasons.append(
+                    f"holdout MAPE {metrics['holdout_mape']} % "
+                    f"worse than parent {parent_mape} %"
+                )
+                mode = "full"
+        except CatBoostError as e:
+            reasons.append(f"update failed: {e}")
+            mode = "full"
+    if mode == "full":
+        if warm_start:
+            logger.info("Full retrain: %s", "; ".join(reasons))
+        new_model, metrics, split = train_full(df, thread_count)
+        seen_rows = np.array([], dtype=np.uint64)
+
+    if drift is not None:
+        drift["full_retrain"] = mode == "full"
+    X, _ = split_target(df)
+    version = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    new_metadata = {
+        "version": version,
+        "parent": metadata.get("version") if mode == "update" else None,
+        # Holdout is shared by full model and its updates
+        "holdout_version": metadata["holdout_version"]
+        if mode == "update" else version,
+        "mode": mode,
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "n_rows": len(df),
+        "n_new_rows": len(new_df),
+        "metrics": metrics,
+        "drift": drift,
+        "feature_stats": get_feature_stats(X),
+    }
+    version = save_model(
+        new_model, models_dir, new_metadata, np.union1d(seen_rows, rows),
+        split
+    )
+    logger.info("Saved model %s (%s): %s", version, mode, metrics)
+    return version
+
+
+@click.command()
+@click.argument("input_filepath", type=click.Path(exists=True))
+@click.argument("models_dir", type=click.Path())
+@click.option(
+    "--warm-start/--full",
+    default=False,
+    help="Continue boosting of latest model on new rows if data not drifted.",
+)
+@click.option(
+    "--metrics-filepath",
+    type=click.Path(),
+    default=None,
+    help="Write version and metrics of latest model to this file.",
+)
+@click.option("--threads", type=int, default=-1, help="Count of threads.")
+def main(
+        input_filepath: str,
+        models_dir: str,
+        warm_start: bool,
+        metrics_filepath: Optional[str],
+        threads: int
+) -> None:
+    """Train model on processed dataset and save new model version.
+
+    @param input_filepath: path to processed dataset
+    @param models_dir: path to models directory
+    @param warm_start: continue boosting of latest model on new rows
+    @param metrics_filepath: path to latest model metrics
+    @param threads: count of CatBoost threads
+    """
+    logging.basicConfig(level=logging.INFO)
+    df = load_features(input_filepath)
+    train(df, models_dir, warm_start=warm_start, thread_count=threads)
+    if metrics_filepath:
+        registry = load_registry(models_dir)
+        with open(metrics_filepath, "w", encoding="utf-8") as f:
+            json.dump(registry["versions"][-1], f, ensure_ascii=False,
+                      indent=4)
+
+
+if __name__ == "__main__":
+    main()
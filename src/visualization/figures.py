@@ -0,0 +1,14 @@
+"""Names of report figures, shared by visualize.py and workflow."""
+CORRELATION_HEATMAP = "correlation_heatmap.png"
+PRICE_BOXPLOT = "price_boxplot.png"
+PRICE_HISTOGRAM = "price_histogram.png"
+AREA_PRICE_SCATTER = "area_price_scatter.png"
+DISTRICT_PRICE = "district_price.png"
+
+FIGURE_NAMES = [
+    CORRELATION_HEATMAP,
+    PRICE_BOXPLOT,
+    PRICE_HISTOGRAM,
+    AREA_PRICE_SCATTER,
+    DISTRICT_PRICE,
+]
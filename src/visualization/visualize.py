@@ -0,0 +1,240 @@
+"""Render report figures from processed dataset."""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import click
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import seaborn as sns  # noqa: E402
+
+from ..features.build_features import TARGET, load_features  # noqa: E402
+from .figures import (  # noqa: E402
+    AREA_PRICE_SCATTER,
+    CORRELATION_HEATMAP,
+    DISTRICT_PRICE,
+    PRICE_BOXPLOT,
+    PRICE_HISTOGRAM,
+)
+
+BINS = 50
+
+SAMPLE_SIZE = 2000
+
+MAX_FLIERS = 200
+
+RANDOM_STATE = 42
+
+AREA = "Общая площадь, м^2"
+
+DISTRICT = "Район"
+
+
+def aggregate_correlation(df: pd.DataFrame) -> pd.DataFrame:
+    """Get Pearson correlation matrix of numeric columns.
+
+    @param df: processed dataset
+    @return: correlation matrix
+    """
+    return df.select_dtypes("number").corr(method="pearson")
+
+
+def aggregate_boxplot(df: pd.DataFrame) -> Dict[str, Any]:
+    """Get boxplot stats of price.
+
+    Fliers are sampled, extreme ones are always kept.
+
+    @param df: processed dataset
+    @return: stats for matplotlib bxp
+    """
+    price = df[TARGET].dropna()
+    q1, med, q3 = price.quantile([0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    inside = price[(price >= q1 - 1.5 * iqr) & (price <= q3 + 1.5 * iqr)]
+    fliers = price[(price < inside.min()) | (price > inside.max())].unique()
+    if len(fliers) > MAX_FLIERS:
+        rng = np.random.default_rng(RANDOM_STATE)
+        fliers = np.concatenate([
+            [fliers.min(), fliers.max()],
+            rng.choice(fliers, MAX_FLIERS - 2, replace=False),
+        ])
+    return {
+        "med": med,
+        "q1": q1,
+        "q3": q3,
+        "whislo": inside.min(),
+        "whishi": inside.max(),
+        "fliers": fliers,
+        "label": TARGET,
+    }
+
+
+def aggregate_histogram(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Get binned price histogram.
+
+    @param df: processed dataset
+    @return: counts and bin edges
+    """
+    return np.histogram(df[TARGET].dropna(), bins=BINS)
+
+
+def aggregate_scatter(df: pd.DataFrame) -> pd.DataFrame:
+    """Get sample of area and price pairs.
+
+    @param df: processed dataset
+    @return: sampled rows
+    """
+    df = df[[AREA, TARGET]].dropna()
+    return df.sample(min(SAMPLE_SIZE, len(df)), random_state=RANDOM_STATE)
+
+
+def aggregate_district(df: pd.DataFrame) -> pd.Series:
+    """Get median price per square meter by district.
+
+    @param df: processed dataset
+    @return: median price per square meter
+    """
+    price = df[TARGET] / df[AREA].replace(0, np.nan)
+    return price.groupby(df[DISTRICT]).median().dropna().sort_values()
+
+
+def plot_correlation(corr: pd.DataFrame, ax: plt.Axes) -> None:
+    """Plot correlation heatmap.
+
+    @param corr: correlation matrix
+    @param ax: axes
+    """
+    sns.heatmap(corr, vmin=-1, vmax=1, annot=True, fmt=".2f", ax=ax)
+    ax.set_title("Correlation Heatmap", fontdict={"fontsize": 12}, pad=12)
+
+
+def plot_boxplot(stats: Dict[str, Any], ax: plt.Axes) -> None:
+    """Plot price boxplot.
+
+    @param stats: boxplot stats
+    @param ax: axes
+    """
+    ax.bxp([stats])
+    ax.set_title("Price boxplot")
+
+
+def plot_histogram(
+        histogram: Tuple[np.ndarray, np.ndarray],
+        ax: plt.Axes
+) -> None:
+    """Plot price histogram.
+
+    @param histogram: counts and bin edges
+    @param ax: axes
+    """
+    counts, edges = histogram
+    ax.stairs(counts, edges, fill=True)
+    ax.set_xlabel(TARGET)
+    ax.set_title("Price distribution")
+
+
+def plot_scatter(sample: pd.DataFrame, ax: plt.Axes) -> None:
+    """Plot price against total area.
+
+    @param sample: sampled rows
+    @param ax: axes
+    """
+    ax.scatter(sample[AREA], sample[TARGET], s=5, alpha=0.5)
+    ax.set_xlabel(AREA)
+    ax.set_ylabel(TARGET)
+    ax.set_title(f"Price vs area ({len(sample)} sampled ads)")
+
+
+def plot_district(price: pd.Series, ax: plt.Axes) -> None:
+    """Plot median price per square meter by district.
+
+    @param price: median price per square meter
+    @param ax: axes
+    """
+    ax.barh(price.index, price.values)
+    ax.set_xlabel("Медианная стоимость м^2, р.")
+    ax.set_title("Price per square meter by district")
+
+
+# Figure file name: (aggregate, plot, figure size)
+FIGURES: Dict[str, Tuple[Callable, Callable, Tuple[int, int]]] = {
+    CORRELATION_HEATMAP: (aggregate_correlation, plot_correlation, (16, 6)),
+    PRICE_BOXPLOT: (aggregate_boxplot, plot_boxplot, (10, 4)),
+    PRICE_HISTOGRAM: (aggregate_histogram, plot_histogram, (10, 6)),
+    AREA_PRICE_SCATTER: (aggregate_scatter, plot_scatter, (10, 6)),
+    DISTRICT_PRICE: (aggregate_district, plot_district, (10, 8)),
+}
+
+
+def render_figure(
+        plot: Callable,
+        data: Any,
+        figsize: Tuple[int, int],
+        output_filepath: str
+) -> str:
+    """Render one figure from aggregated data and save it.
+
+    @param plot: plot function
+    @param data: aggregated data
+    @param figsize: figure size
+    @param output_filepath: path to figure
+    @return: path to figure
+    """
+    fig, ax = plt.subplots(figsize=figsize)
+    plot(data, ax)
+    fig.tight_layout()
+    fig.savefig(output_filepath)
+    plt.close(fig)
+    return output_filepath
+
+
+def render_report(
+        df: pd.DataFrame,
+        output_dir: str,
+        workers: Optional[int] = None
+) -> None:
+    """Aggregate data and render all report figures in process pool.
+
+    @param df: processed dataset
+    @param output_dir: path to figures directory
+    @param workers: count of worker processes
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                render_figure,
+                plot,
+                aggregate(df),
+                figsize,
+                os.path.join(output_dir, name),
+            )
+            for name, (aggregate, plot, figsize) in FIGURES.items()
+        ]
+        for future in futures:
+            future.result()
+
+
+@click.command()
+@click.argument("input_filepath", type=click.Path(exists=True))
+@click.argument("output_dir", type=click.Path())
+@click.option("--workers", type=int, default=None,
+              help="Count of worker processes, CPU count if not set.")
+def main(input_filepath: str, output_dir: str, workers: Optional[int]) -> None:
+    """Render report figures from processed dataset.
+
+    @param input_filepath: path to processed dataset
+    @param output_dir: path to figures directory
+    @param workers: count of worker processes
+    """
+    df = load_features(input_filepath)
+    render_report(df, output_dir, workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import time
+
+import pandas as pd
+import pytest
+from catboost import CatBoostRegressor
+
+from src.features.build_features import build_features
+from src.models.explain_model import Explainer
+from src.models.train_model import make_pool, split_target
+
+
+@pytest.fixture(scope="module")
+def dataset() -> pd.DataFrame:
+    return build_features(pd.read_csv("data/interim/data_interim.csv"))
+
+
+@pytest.fixture(scope="module")
+def features(dataset) -> pd.DataFrame:
+    X, _ = split_target(dataset)
+    return X
+
+
+@pytest.fixture(scope="module")
+def model(dataset) -> CatBoostRegressor:
+    X, y = split_target(dataset)
+    model = CatBoostRegressor(
+        iterations=100, allow_writing_files=False, verbose=False
+    )
+    model.fit(make_pool(X, y))
+    return model
+
+
+def count_shap_calls(explainer, monkeypatch):
+    calls = []
+    shap_values = explainer.shap_values
+
+    def counted(X):
+        calls.append(len(X))
+        return shap_values(X)
+
+    monkeypatch.setattr(explainer, "shap_values", counted)
+    return calls
+
+
+def test_explain_caches_int_and_float_rows_together(model, features):
+    explainer = Explainer(model)
+    row = features.iloc[[0]].astype({"Этаж": float})
+
+    first = explainer.explain(row)
+    second = explainer.explain(row.astype({"Этаж": int}))
+
+    assert len(explainer._cache) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_explain_caches_rows_with_missing_values(
+        model, features, monkeypatch
+):
+    explainer = Explainer(model)
+    row = features.iloc[[0]].assign(**{"Год постройки": float("nan")})
+    calls = count_shap_calls(explainer, monkeypatch)
+
+    explainer.explain(row)
+    explainer.explain(row.copy())
+
+    assert calls == [1]
+
+
+def test_explain_computes_only_uncached_unique_rows(
+        model, features, monkeypatch
+):
+    explainer = Explainer(model)
+    calls = count_shap_calls(explainer, monkeypatch)
+
+    explainer.explain(features.iloc[[0, 1, 0]])
+    explainer.explain(features.iloc[[1, 2]])
+
+    assert calls == [2, 1]
+
+
+def test_explain_uses_model_feature_order(model, features):
+    explainer = Explainer(model)
+    row = features.iloc[[0]]
+
+    first = explainer.explain(row)
+    second = explainer.explain(row[row.columns[::-1]])
+
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_cache_hit_skips_shap_and_is_fast(model, features, monkeypatch):
+    explainer = Explainer(model)
+    row = features.iloc[[0]]
+
+    start = time.perf_counter()
+    explainer.explain(row)
+    miss = time.perf_counter() - start
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cache hit must not compute SHAP values")
+
+    monkeypatch.setattr(model, "get_feature_importance", fail)
+    start = time.perf_counter()
+    for _ in range(10):
+        explainer.explain(row)
+    hit = (time.perf_counter() - start) / 10
+
+    assert hit < miss / 3
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+
+from src.features.build_features import build_features, load_features
+from src.models import train_model
+from src.models.train_model import (
+    check_drift,
+    get_feature_stats,
+    hash_rows,
+    load_model,
+    load_registry,
+    split_target,
+    train,
+)
+
+
+def make_dataset() -> pd.DataFrame:
+    return pd.DataFrame({
+        "Общая площадь, м^2": [36.98, 46.5, 88.6],
+        "Этаж": [12, 14, 5],
+        "Стоимость, р.": [8500000, 9000000, 18500000],
+        "Тип жилья": ["Вторичка", "Вторичка", "Новостройка"],
+        "Планировка": ["Смежная", "nan", "Изолированная"],
+        "Санузел": ["1 совмещенный", "1 раздельный", "nan"],
+        "Ремонт": ["Косметический", "Косметический", "Без ремонта"],
+        "Вид из окон": ["На улицу", "nan", "Во двор"],
+        "Балкон/лоджия": ["1 балкон", "nan", "nan"],
+        "Технология строительства": ["panel", "monolith", "brick"],
+        "Район": ["Невский", "Московский", "Выборгский"],
+        "Станция метро": ["Дыбенко", "Парк Победы", "Черная речка"],
+    })
+
+
+def test_hash_rows_ignores_int_to_float_cast(tmp_path):
+    df = make_dataset()
+    seen = hash_rows(df)
+    new_row = df.iloc[[0]].assign(**{"Этаж": np.nan})
+    filepath = tmp_path / "data.csv"
+    pd.concat([df, new_row], ignore_index=True).to_csv(filepath, index=False)
+
+    reloaded = load_features(filepath)
+
+    assert reloaded["Этаж"].dtype == np.float64
+    rows = hash_rows(reloaded)
+    assert np.isin(rows[:len(df)], seen).all()
+    assert not np.isin(rows[len(df):], seen).any()
+
+
+def test_hash_rows_ignores_column_order():
+    df = make_dataset()
+
+    assert (hash_rows(df) == hash_rows(df[df.columns[::-1]])).all()
+
+
+def load_dataset() -> pd.DataFrame:
+    return build_features(pd.read_csv("data/interim/data_interim.csv"))
+
+
+class ConstantModel:
+    def predict(self, pool):
+        return np.full(pool.num_row(), 9000000.0)
+
+
+def make_metadata(df: pd.DataFrame) -> dict:
+    X, _ = split_target(df)
+    return {
+        "feature_stats": get_feature_stats(X),
+        "n_rows": len(df),
+        "metrics": {"holdout_mape": 1000.0},
+    }
+
+
+def test_check_drift_keeps_update_for_batch_from_same_data():
+    df = load_dataset()
+
+    drift = check_drift(ConstantModel(), make_metadata(df), df.iloc[:10])
+
+    assert not drift["full_retrain"]
+
+
+def test_check_drift_forces_full_retrain_on_mean_shift():
+    df = load_dataset()
+    new_df = df.iloc[:30].copy()
+    new_df["Общая площадь, м^2"] *= 3
+
+    drift = check_drift(ConstantModel(), make_metadata(df), new_df)
+
+    assert drift["full_retrain"]
+    assert "Общая площадь, м^2" in drift["reasons"][0]
+
+
+def test_check_drift_forces_full_retrain_on_unseen_categories():
+    df = load_dataset()
+    new_df = df.iloc[:30].assign(**{"Район": "Новый район"})
+
+    drift = check_drift(ConstantModel(), make_metadata(df), new_df)
+
+    assert drift["full_retrain"]
+    assert drift["unseen_categories_share"] == 1.0
+
+
+def test_update_is_scored_on_parent_holdout(tmp_path):
+    df = load_dataset()
+    parent = train(df.iloc[:580], str(tmp_path), thread_count=1)
+
+    version = train(df, str(tmp_path), warm_start=True, thread_count=1)
+
+    latest = load_registry(str(tmp_path))["versions"][-1]
+    assert latest["version"] == version
+    assert latest["mode"] == "update"
+    assert latest["parent"] == parent
+    assert latest["holdout_version"] == parent
+    assert "holdout_mape" in latest["metrics"]
+
+
+def test_update_worse_on_holdout_falls_back_to_full_retrain(
+        tmp_path, monkeypatch
+):
+    df = load_dataset()
+    train(df.iloc[:580], str(tmp_path), thread_count=1)
+
+    def worse_update(model, *args, **kwargs):
+        return model, {"train_mape": 1.0, "valid_mape": 1.0,
+                       "holdout_mape": 1000.0}
+
+    monkeypatch.setattr(train_model, "train_update", worse_update)
+    version = train(df, str(tmp_path), warm_start=True, thread_count=1)
+
+    _, metadata, _ = load_model(str(tmp_path))
+    assert metadata["version"] == version
+    assert metadata["mode"] == "full"
+    assert metadata["holdout_version"] == version
+    assert any("holdout MAPE" in reason
+               for reason in metadata["drift"]["reasons"])
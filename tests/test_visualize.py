@@ -0,0 +1,6 @@
+from src.visualization.figures import FIGURE_NAMES
+from src.visualization.visualize import FIGURES
+
+
+def test_rendered_figures_match_workflow_outputs():
+    assert list(FIGURES) == FIGURE_NAMES